@@ -1,21 +1,83 @@
+import asyncio
+import atexit
+import codecs
+import csv
+import importlib.util
 import json
 import logging
+import mmap
 import os
+import queue
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from os.path import expanduser
-from time import sleep
+from time import monotonic, sleep, time
 
-import pandas as pd
 import ast
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+try:
+    import httpx  # 可选依赖，仅异步提交需要
+except ImportError:
+    httpx = None
+
+try:
+    import orjson  # 可选依赖，解析速度约为标准库 json 的 2~3 倍
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    带大缓冲区的文件Handler
+    不再每条记录都 flush，而是由后台线程每 flush_interval 秒定时 flush 一次；
+    WARNING 及以上的记录立即 flush，关闭时写出剩余内容
+    """
+
+    def __init__(self, filename, encoding=None, buffer_size=64 * 1024, flush_interval=1.0):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        super().__init__(filename, encoding=encoding)
+
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name='LogFlusher', daemon=True)
+        self._flusher.start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def _flush_periodically(self):
+        while not self._stop_flusher.wait(self.flush_interval):
+            super().flush()
+
+    def flush(self):
+        # 每条记录之后不立即 flush，交给后台线程定时处理
+        pass
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.WARNING:
+            super().flush()
+
+    def close(self):
+        self._stop_flusher.set()
+        super().close()
 
 
 def setup_logger(name='AlphaCommit', log_dir='logs', level=logging.DEBUG):
     """
     初始化日志系统
     - 控制台：显示INFO及以上
-    - 文件：记录DEBUG及以上，按日期分割
+    - 文件：记录DEBUG及以上，按日期分割，由后台线程批量写入
     """
     # 创建logger
     logger = logging.getLogger(name)
@@ -45,12 +107,18 @@ def setup_logger(name='AlphaCommit', log_dir='logs', level=logging.DEBUG):
     logger.addHandler(console_handler)
 
     # 文件Handler - 记录DEBUG及以上
+    # 写文件放到后台线程：主线程只把日志记录放入队列，不会被磁盘写入阻塞
     log_file = os.path.join(log_dir, f"alpha_commit_{datetime.now().strftime('%Y%m%d')}.log")
     try:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = _BufferedFileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
     except PermissionError:
         logger.warning(f"⚠️ 日志文件写入失败，仅输出到控制台: {log_file}")
 
@@ -61,13 +129,72 @@ def setup_logger(name='AlphaCommit', log_dir='logs', level=logging.DEBUG):
 logger = setup_logger()
 
 
+# 提交失败时从响应文本中提取各项指标的 value
+_FAIL_CHECK_RE = re.compile(
+    r'"name":\s*"(LOW_SHARPE|LOW_FITNESS|HIGH_TURNOVER|LOW_SUB_UNIVERSE_SHARPE|SELF_CORRELATION)"'
+    r'[^}]*?"value":\s*([^,}\s]+)'
+)
+
+
+class _RateLimiter:
+    """
+    令牌桶限流器（线程安全）
+    每秒补充 rate 个令牌，最多积累 capacity 个；无令牌时等待而不是固定 sleep
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """预约一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """阻塞直到获得一个令牌"""
+        wait = self.reserve()
+        if wait > 0:
+            sleep(wait)
+
+
 class BrainAPIClient:
     API_BASE_URL = 'https://api.worldquantbrain.com'
+    SUBMIT_INTERVAL = 10  # 两次提交之间的最小间隔（秒）
+    MAX_POLL_INTERVAL = 30  # 轮询提交状态的最大等待间隔（秒）
+    SESSION_CACHE_FILE = '~/.cache/wq_brain_session.json'  # 会话 Cookie 缓存文件
+    SESSION_EXPIRY_MARGIN = 3600  # 缓存会话剩余有效期不足该值（秒）时不再复用，留出一次完整提交运行的时间
 
     def __init__(self, credentials_file='brain_credentials_copy.txt'):
         """初始化 API 客户端"""
 
         self.session = requests.Session()
+        # 连接池复用 keep-alive 连接，避免反复 TLS 握手，并对限流/服务端错误自动重试
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            pool_block=False,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+        self.rate_limiter = _RateLimiter(rate=1 / self.SUBMIT_INTERVAL)
+        # 并发提交时多个请求可能同时收到 401，用锁和认证代数保证只重新认证一次
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
         self._setup_authentication(credentials_file)
 
     def _setup_authentication(self, credentials_file):
@@ -77,41 +204,162 @@ class BrainAPIClient:
             with open(expanduser(credentials_file)) as f:
                 credentials = json.load(f)
             username, password = credentials
-            self.session.auth = HTTPBasicAuth(username, password)
+            self._username = username
+            # 认证头只计算一次，而不是每个请求都经 HTTPBasicAuth 重新生成
+            prepared = HTTPBasicAuth(username, password)(requests.Request('POST', self.API_BASE_URL).prepare())
+            self.session.headers['Authorization'] = prepared.headers['Authorization']
             self.session.trust_env = False # 禁用代理
 
-            response = self.session.post(f"{self.API_BASE_URL}/authentication")
-            if response.status_code not in [200, 201]:
-                raise Exception(f"认证失败: HTTP {response.status_code}")
+            # 复用上次运行缓存的未过期会话，省去一次认证请求
+            if self._load_cached_session():
+                logger.info("✅ 复用已缓存的会话，跳过认证")
+                return
 
-            logger.info("✅ 认证成功!")
+            self._authenticate()
 
         except Exception as e:
             logger.error(f"❌ 认证错误: {str(e)}")
             raise
 
+    def _authenticate(self):
+        """向服务端认证，并缓存返回的会话 Cookie"""
+
+        response = self.session.post(f"{self.API_BASE_URL}/authentication")
+        if response.status_code not in [200, 201]:
+            raise Exception(f"认证失败: HTTP {response.status_code}")
+
+        self._save_cached_session(response)
+        logger.info("✅ 认证成功!")
+
+    def _reauthenticate(self, generation):
+        """
+        会话失效时重新认证
+        generation 为发出请求时的认证代数；若期间其他线程已重新认证过，则直接复用新会话
+        """
+        with self._auth_lock:
+            if self._auth_generation != generation:
+                return
+            logger.warning("⚠️ 会话已失效，重新认证")
+            self._authenticate()
+            self._auth_generation += 1
+
+    @staticmethod
+    def _session_expiry(response):
+        """从认证响应中取会话过期时间戳，取不到时使用 Cookie 自身的过期时间"""
+        try:
+            return time() + float(response.json()['token']['expiry'])
+        except (ValueError, KeyError, TypeError):
+            expires = [cookie.expires for cookie in response.cookies if cookie.expires]
+            return min(expires) if expires else None
+
+    def _load_cached_session(self):
+        """
+        读取缓存的会话 Cookie，属于当前账号且未过期时载入并返回 True
+        缓存文件缺失、损坏或格式不符时一律视为未命中，交由调用方重新认证
+        """
+        try:
+            with open(expanduser(self.SESSION_CACHE_FILE)) as f:
+                cache = json.load(f)
+
+            if cache.get('username') != self._username:
+                return False
+            if float(cache['expiry']) - self.SESSION_EXPIRY_MARGIN <= time():
+                return False
+            cookies = dict(cache['cookies'])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+        self.session.cookies.update(cookies)
+        return True
+
+    def _save_cached_session(self, response):
+        """将会话 Cookie 及其过期时间写入缓存文件（仅当前用户可读写）"""
+        expiry = self._session_expiry(response)
+        if expiry is None:
+            return
+
+        cache = {
+            'username': self._username,
+            'expiry': expiry,
+            'cookies': requests.utils.dict_from_cookiejar(self.session.cookies)
+        }
+        path = expanduser(self.SESSION_CACHE_FILE)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"⚠️ 会话缓存写入失败: {e}")
+
+    def _poll_delay(self, retry):
+        """状态轮询的等待时间：服务端 Retry-After 封顶后加少量随机抖动，避免请求扎堆"""
+        return min(retry, self.MAX_POLL_INTERVAL) + random.uniform(0, 1)
+
+    def _retry_delay(self, attempt):
+        """POST 失败后的指数退避等待时间"""
+        return min(3 * 2 ** attempt, self.MAX_POLL_INTERVAL)
+
+    @staticmethod
+    def _log_submit_failure(text):
+        """输出提交失败时各项指标的检查结果，直接从响应文本中提取，不做完整的 JSON 解析"""
+        # 同名指标出现多次时以第一次（即 'is' 部分）为准
+        check_results = dict(reversed(_FAIL_CHECK_RE.findall(text)))
+        msg = (f"❌ 提交失败: SHARPE: PASS[{check_results.get('LOW_SHARPE')}], " \
+        f"FITNESS: PASS[{check_results.get('LOW_FITNESS')}], " \
+        f"TURNOVER: PASS[{check_results.get('HIGH_TURNOVER')}], " \
+        f"SUB_UNIVERSE_SHARPE: PASS[{check_results.get('LOW_SUB_UNIVERSE_SHARPE')}], " \
+        f"SELF_CORRELATION: FAIL[{check_results.get('SELF_CORRELATION')}]")
+        logger.error(msg)
+
     def submit_alpha(self, alpha_id):
         """提交单个 Alpha"""
 
         submit_url = f"{self.API_BASE_URL}/alphas/{alpha_id}/submit"
 
+        # 距上次提交不足 SUBMIT_INTERVAL 时才等待
+        self.rate_limiter.acquire()
+
+        # 会话失效时只重新认证一次，重新认证后仍返回 401 则报错，而不是当作提交失败把 Alpha 丢掉
+        reauthenticated = False
         for attempt in range(5):
             logger.info(f"🔄 第 {attempt + 1} 次尝试提交 Alpha {alpha_id}")
 
             # POST 请求
+            generation = self._auth_generation
             res = self.session.post(submit_url)
+            if res.status_code == 401:
+                if reauthenticated:
+                    raise Exception(f"重新认证后仍返回 401: Alpha {alpha_id}")
+                self._reauthenticate(generation)
+                reauthenticated = True
+                continue
+            reauthenticated = False
+
             if res.status_code == 201:
                 logger.info("✅ POST:等待提交完成...")
             elif res.status_code in [400, 403]:
                 logger.warning(f"❌ 提交被拒绝 ({res.status_code})")
                 return False
             else:
-                sleep(3)
+                # 被限流时按服务端给出的 Retry-After 等待，否则指数退避
+                sleep(float(res.headers.get('Retry-After', 0)) or self._retry_delay(attempt))
                 continue
 
             # 检查提交状态
             while True:
+                generation = self._auth_generation
                 res = self.session.get(submit_url)
+
+                if res.status_code == 401:
+                    # 轮询期间会话过期，重新认证后继续轮询，而不是当作提交失败
+                    if reauthenticated:
+                        raise Exception(f"重新认证后仍返回 401: Alpha {alpha_id}")
+                    self._reauthenticate(generation)
+                    reauthenticated = True
+                    continue
+                reauthenticated = False
+
                 retry = float(res.headers.get('Retry-After', 0))
 
                 if retry == 0:
@@ -119,18 +367,77 @@ class BrainAPIClient:
                         logger.info("✅ 提交成功!")
                         return True
                     else:
-                        data = res.json()
-                        checks = data.get('is', {}).get('checks', [])
-                        check_results = {item.get('name'): item.get('value') for item in checks}
-                        msg = (f"❌ 提交失败: SHARPE: PASS[{check_results.get('LOW_SHARPE')}], " \
-                        f"FITNESS: PASS[{check_results.get('LOW_FITNESS')}], " \
-                        f"TURNOVER: PASS[{check_results.get('HIGH_TURNOVER')}], " \
-                        f"SUB_UNIVERSE_SHARPE: PASS[{check_results.get('LOW_SUB_UNIVERSE_SHARPE')}], " \
-                        f"SELF_CORRELATION: FAIL[{check_results.get('SELF_CORRELATION')}]")
-                        logger.error(msg)
+                        self._log_submit_failure(res.text)
+                        return False
+
+                sleep(self._poll_delay(retry))
+
+        return False
+
+    async def _reauthenticate_async(self, client, generation):
+        """在线程池中重新认证，不阻塞事件循环，并把新会话 Cookie 同步到 httpx 客户端"""
+        await asyncio.to_thread(self._reauthenticate, generation)
+        client.cookies.update(self.session.cookies)
+
+    async def submit_alpha_async(self, client, alpha_id):
+        """异步提交单个 Alpha，流程与 submit_alpha 相同，但等待期间不占用线程"""
+
+        submit_url = f"{self.API_BASE_URL}/alphas/{alpha_id}/submit"
+
+        # 距上次提交不足 SUBMIT_INTERVAL 时才等待
+        await asyncio.sleep(self.rate_limiter.reserve())
+
+        # 会话失效时只重新认证一次，重新认证后仍返回 401 则报错，而不是当作提交失败把 Alpha 丢掉
+        reauthenticated = False
+        for attempt in range(5):
+            logger.info(f"🔄 第 {attempt + 1} 次尝试提交 Alpha {alpha_id}")
+
+            # POST 请求
+            generation = self._auth_generation
+            res = await client.post(submit_url)
+            if res.status_code == 401:
+                if reauthenticated:
+                    raise Exception(f"重新认证后仍返回 401: Alpha {alpha_id}")
+                await self._reauthenticate_async(client, generation)
+                reauthenticated = True
+                continue
+            reauthenticated = False
+
+            if res.status_code == 201:
+                logger.info(f"✅ POST:等待 Alpha {alpha_id} 提交完成...")
+            elif res.status_code in [400, 403]:
+                logger.warning(f"❌ Alpha {alpha_id} 提交被拒绝 ({res.status_code})")
+                return False
+            else:
+                # 被限流时按服务端给出的 Retry-After 等待，否则指数退避
+                await asyncio.sleep(float(res.headers.get('Retry-After', 0)) or self._retry_delay(attempt))
+                continue
+
+            # 检查提交状态
+            while True:
+                generation = self._auth_generation
+                res = await client.get(submit_url)
+
+                if res.status_code == 401:
+                    # 轮询期间会话过期，重新认证后继续轮询，而不是当作提交失败
+                    if reauthenticated:
+                        raise Exception(f"重新认证后仍返回 401: Alpha {alpha_id}")
+                    await self._reauthenticate_async(client, generation)
+                    reauthenticated = True
+                    continue
+                reauthenticated = False
+
+                retry = float(res.headers.get('Retry-After', 0))
+
+                if retry == 0:
+                    if res.status_code == 200:
+                        logger.info(f"✅ Alpha {alpha_id} 提交成功!")
+                        return True
+                    else:
+                        self._log_submit_failure(res.text)
                         return False
 
-                sleep(retry)
+                await asyncio.sleep(self._poll_delay(retry))
 
         return False
 
@@ -145,11 +452,192 @@ class BrainAPIClient:
             else:
                 failed.append(alpha_id)
 
-            if alpha_id != alpha_ids[-1]:
-                sleep(10)
+        return successful, failed
+
+    def submit_multiple_alphas_parallel(self, alpha_ids, max_workers=4):
+        """
+        并发批量提交 Alpha
+        提交请求仍由限流器按间隔依次发出，但各 Alpha 的状态轮询在线程间相互重叠
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.submit_alpha, alpha_ids))
+
+        successful = [aid for aid, ok in zip(alpha_ids, results) if ok]
+        failed = [aid for aid, ok in zip(alpha_ids, results) if not ok]
+        return successful, failed
 
+    async def _submit_batch_async(self, alpha_ids, max_connections):
+        """在同一个 httpx.AsyncClient 上并发提交一批 Alpha"""
+        async with httpx.AsyncClient(
+            headers={'Authorization': self.session.headers['Authorization']},
+            cookies=self.session.cookies,
+            http2=importlib.util.find_spec('h2') is not None,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=self.MAX_POLL_INTERVAL,
+            trust_env=False  # 禁用代理
+        ) as client:
+            return await asyncio.gather(*(self.submit_alpha_async(client, aid) for aid in alpha_ids))
+
+    def submit_multiple_alphas_async(self, alpha_ids, max_connections=32):
+        """
+        异步批量提交 Alpha（需要安装 httpx）
+        所有 Alpha 的状态轮询在单个线程的事件循环中并发进行
+        """
+        if httpx is None:
+            raise ImportError("异步提交需要安装 httpx: pip install httpx")
+
+        results = asyncio.run(self._submit_batch_async(alpha_ids, max_connections))
+
+        successful = [aid for aid, ok in zip(alpha_ids, results) if ok]
+        failed = [aid for aid, ok in zip(alpha_ids, results) if not ok]
         return successful, failed
 
+
+def _extract_checks(stats_str):
+    """
+    从统计字符串中截取并解析 'checks' 列表
+
+    只解析 checks 部分而不是整个字典：先尝试 json（已安装 orjson 时用 orjson），
+    遇到 json 无法处理的写法时再回退到 ast.literal_eval。
+    """
+    start = stats_str.find("'checks':")
+    if start == -1:
+        return []
+    start = stats_str.find('[', start)
+    if start == -1:
+        return []
+
+    # 括号匹配，找到与开头 '[' 对应的 ']'
+    depth, pos = 0, start
+    while True:
+        end = stats_str.find(']', pos)
+        if end == -1:
+            raise ValueError("checks 列表不完整")
+        depth += stats_str.count('[', pos, end) - 1
+        pos = end + 1
+        if depth == 0:
+            break
+
+    checks_str = stats_str[start:end + 1]
+    normalized = (checks_str.replace("'", '"')
+                  .replace('None', 'null')
+                  .replace('True', 'true')
+                  .replace('False', 'false'))
+    try:
+        return _json_loads(normalized)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError 是其子类
+        return ast.literal_eval(checks_str)
+
+
+# 需要强制检查通过的指标集合
+REQUIRED_CHECKS = frozenset({
+    'LOW_SHARPE',
+    'LOW_FITNESS',
+    'LOW_TURNOVER',
+    'HIGH_TURNOVER',
+    'CONCENTRATED_WEIGHT',
+    'LOW_SUB_UNIVERSE_SHARPE'
+})
+
+# 定位各项关键指标及其 result 的字符串标记
+_CHECK_NAME_MARKERS = tuple(f"'name': '{name}'" for name in sorted(REQUIRED_CHECKS))
+_RESULT_MARKER = "'result': '"
+
+
+def _checks_qualified(checks_list):
+    """判断 checks 列表中的指定指标是否全部为 'PASS'"""
+    # 注意：这里严格要求为 'PASS'。如果允许 'WARNING'，需修改此处逻辑。
+    passed = {item.get('name') for item in checks_list if item.get('result') == 'PASS'}
+    return REQUIRED_CHECKS <= passed
+
+
+def _scan_checks(stats_str):
+    """
+    直接在原始字符串上查找六项关键指标的 result，不构造字典、元组等中间对象
+
+    依次用 str.find 定位 'name': 'XXX'，紧随其后的通常就是 'result'；
+    否则在同一项 {...} 内向后查找。
+    返回 True/False；某项指标找不到（如字段顺序有变化）时返回 None，由调用方回退到完整解析。
+    """
+    find = stats_str.find
+    start = find("'checks':")
+
+    for marker in _CHECK_NAME_MARKERS:
+        pos = find(marker, start)
+        if pos == -1:
+            return None
+        pos += len(marker)
+
+        if stats_str.startswith(", 'result': 'PASS'", pos):
+            continue
+
+        # 只在当前这一项 {...} 内查找 result
+        end = find('}', pos)
+        pos = find(_RESULT_MARKER, pos, len(stats_str) if end == -1 else end)
+        if pos == -1:
+            return None
+
+        if not stats_str.startswith("PASS'", pos + len(_RESULT_MARKER)):
+            return False
+    return True
+
+
+def _is_qualified(stats_str):
+    """
+    判断单行的六项指标是否全部为 'PASS'
+
+    优先直接扫描原始字符串；若扫描没能找全六项，回退到完整解析 checks 列表。
+    """
+    try:
+        verdict = _scan_checks(stats_str)
+        if verdict is not None:
+            return verdict
+
+        return _checks_qualified(_extract_checks(stats_str))
+    except Exception:
+        # 如果某行解析出错（如格式损坏），视为不合格
+        return False
+
+
+# csv 单个字段的长度上限，取 C long 在各平台上都能容纳的最大值
+CSV_FIELD_SIZE_LIMIT = 2 ** 31 - 1
+
+
+def _iter_mmap_lines(path, encoding='utf-8'):
+    """
+    通过 mmap 逐行读取文件
+    直接从内核页缓存切出每一行，不经过文本文件对象的读缓冲与换行处理
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # 空文件无法 mmap
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 跳过 UTF-8 BOM（Excel 另存的 utf-8-sig 文件会带），否则第一个 ID 会带上 '\ufeff'
+            start = len(codecs.BOM_UTF8) if mm[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b'\n', start)
+                end = size if end == -1 else end + 1
+                yield mm[start:end].decode(encoding)
+                start = end
+
+
+def _iter_candidate_lines(lines):
+    """
+    在原始 CSV 行上预筛选：能直接判定不合格的记录整行跳过，不再做 CSV 解析
+
+    只预筛选完整占据一行的记录；引号内含换行、跨多行的记录原样交给 csv.reader。
+    """
+    in_quotes = False
+    for line in lines:
+        odd_quotes = line.count('"') & 1
+        if not in_quotes and not odd_quotes and "'checks':" in line and _scan_checks(line) is False:
+            continue
+        in_quotes ^= odd_quotes
+        yield line
+
+
 def save_candidate_alpha_ids(simulated_alphas_file, candidate_alpha_id_file):
     """
     从模拟结果中提取合格的 Alpha ID 并保存到文件。
@@ -165,67 +653,39 @@ def save_candidate_alpha_ids(simulated_alphas_file, candidate_alpha_id_file):
     
     忽略其他检查项（如 UNITS 警告等）。
     """
-    
-    # 定义需要强制检查通过的指标集合
-    required_checks = {
-        'LOW_SHARPE', 
-        'LOW_FITNESS', 
-        'LOW_TURNOVER', 
-        'HIGH_TURNOVER', 
-        'CONCENTRATED_WEIGHT', 
-        'LOW_SUB_UNIVERSE_SHARPE'
-    }
-    
+
     valid_alpha_ids = []
 
     try:
-        # 读取 CSV 文件，不带表头，以防表头格式不规范
-        # 如果文件确实有标准表头，可以改为 header=0
-        df = pd.read_csv(simulated_alphas_file, header=None)
-        
-        for _, row in df.iterrows():
-            try:
-                # 1. 提取 Alpha ID (第一列)
-                alpha_id = str(row[0]).strip()
-                
-                # 2. 寻找包含 check 信息的字典列
-                # 由于 CSV 格式可能变动，这里遍历该行所有列，寻找包含 'checks' 字段的字符串
-                stats_str = None
-                for col in row:
-                    if isinstance(col, str) and "'checks':" in col:
-                        stats_str = col
-                        break
-                
-                if not stats_str:
+        # 通过 mmap 逐行流式读取 CSV，不依赖表头，以防表头格式不规范
+        # 大部分不合格的行在预筛选阶段即被跳过，只有剩下的行才做完整的 CSV 解析
+        lines = _iter_mmap_lines(simulated_alphas_file)
+        # stats 列可能远超 csv 默认的 128 KiB 字段上限，放宽上限以免单个大字段中断整个文件的处理
+        csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+        stats_col = None
+        for row in csv.reader(_iter_candidate_lines(lines)):
+            if not row:
+                continue
+
+            # 1. 寻找包含 check 信息的列
+            # 由于 CSV 格式可能变动，在第一条含 'checks' 字段的记录上遍历所有列定位，之后直接按下标读取
+            if stats_col is None:
+                stats_col = next((i for i, col in enumerate(row) if "'checks':" in col), None)
+                if stats_col is None:
                     continue
 
-                # 3. 解析字符串为字典
-                data_dict = ast.literal_eval(stats_str)
-                checks_list = data_dict.get('checks', [])
-                
-                # 将该 Alpha 的所有检查结果转为 {name: result} 的字典映射，方便查询
-                check_results = {item.get('name'): item.get('result') for item in checks_list}
-                
-                # 4. 验证指定的六项指标
-                is_qualified = True
-                for req_metric in required_checks:
-                    # 如果某项关键指标的结果不是 'PASS' (或者是缺失)，则标记为不合格
-                    # 注意：这里严格要求为 'PASS'。如果允许 'WARNING'，需修改此处逻辑。
-                    if check_results.get(req_metric) != 'PASS':
-                        is_qualified = False
-                        break
-                
-                if is_qualified:
-                    valid_alpha_ids.append(alpha_id)
-
-            except Exception as e:
-                # 如果某行解析出错（如格式损坏），跳过该行
+            if stats_col >= len(row) or "'checks':" not in row[stats_col]:
                 continue
-        
-        # 5. 将结果保存到 txt 文件
+            stats_str = row[stats_col]
+
+            # 2. 验证六项指标是否全部 PASS
+            if _is_qualified(stats_str):
+                # 3. 收集 Alpha ID (第一列)
+                valid_alpha_ids.append(row[0].strip())
+
+        # 4. 将结果一次性写入 txt 文件
         with open(candidate_alpha_id_file, 'w', encoding='utf-8') as f:
-            for aid in valid_alpha_ids:
-                f.write(f"{aid}\n")
+            f.write("".join(f"{aid}\n" for aid in valid_alpha_ids))
 
         logger.info(f"处理完成：共找到 {len(valid_alpha_ids)} 个合格的 Alpha，已保存至 {candidate_alpha_id_file}")
 
@@ -235,30 +695,50 @@ def save_candidate_alpha_ids(simulated_alphas_file, candidate_alpha_id_file):
         logger.error(f"发生未知错误：{e}")
 
 
-def _remove_alpha_id_from_file(alpha_id_path, alpha_id):
+def _processed_log_path(alpha_id_path):
+    """已处理 Alpha ID 的追加记录文件路径，如 alpha_ids.txt -> alpha_ids_processed.log"""
+    root, _ = os.path.splitext(alpha_id_path)
+    return f"{root}_processed.log"
+
+
+def _load_processed_alpha_ids(processed_path):
+    """读取已处理的 Alpha ID 集合（上次运行中断时遗留的记录）"""
+    if not os.path.exists(processed_path):
+        return set()
+
+    with open(processed_path, 'r') as f:
+        return {aid for aid in (line.strip() for line in f) if aid}
+
+
+def _save_remaining_alpha_ids(alpha_id_path, order, remaining):
     """
-    实时从文件中移除已处理的 Alpha ID
-    用于确保程序中断时不会丢失处理进度
+    按原有顺序将尚未处理的 Alpha ID 写回文件，并清理已处理记录文件
+    只在提交开始（恢复上次进度）和结束/中断时各调用一次，避免每提交一个就重写整个文件
 
     应用原则:
     - SOLID: 单一职责原则，专注文件更新操作
     - KISS: 简单直接的文件读写逻辑
     """
     try:
-        if not os.path.exists(alpha_id_path):
-            return
-
-        with open(alpha_id_path, 'r') as f:
-            alpha_ids = [line.strip() for line in f.readlines() if line.strip()]
-
-        # 移除已处理的ID
-        if alpha_id in alpha_ids:
-            alpha_ids.remove(alpha_id)
+        # 先写临时文件再原子替换，写到一半中断也不会丢失原文件
+        tmp_path = f"{alpha_id_path}.tmp"
+        try:
+            with open(tmp_path, 'w', buffering=1 << 16) as f:
+                f.writelines(f"{aid}\n" for aid in order if aid in remaining)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, alpha_id_path)
+        except BaseException:
+            # 写入或替换失败时清理临时文件，原文件保持不变
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-            with open(alpha_id_path, 'w') as f:
-                f.writelines([f"{aid}\n" for aid in alpha_ids])
+        processed_path = _processed_log_path(alpha_id_path)
+        if os.path.exists(processed_path):
+            os.remove(processed_path)
 
-            logger.debug(f"✅ 已从文件中移除 Alpha ID: {alpha_id}")
+        logger.debug(f"✅ 已更新 Alpha ID 文件，剩余 {len(remaining)} 个")
     except Exception as e:
         logger.error(f"❌ 更新文件时出错: {str(e)}")
 
@@ -272,7 +752,17 @@ def submit_alpha_ids(alpha_id_path, num_to_submit=2):
             return
 
         with open(alpha_id_path, 'r') as f:
-            alpha_ids = [line.strip() for line in f.readlines() if line.strip()]
+            order = [aid for aid in (line.strip() for line in f) if aid]
+        remaining = set(order)
+
+        # 恢复上次中断前的进度：已处理但尚未从文件中移除的ID
+        processed_path = _processed_log_path(alpha_id_path)
+        processed_ids = _load_processed_alpha_ids(processed_path)
+        if processed_ids:
+            remaining -= processed_ids
+            _save_remaining_alpha_ids(alpha_id_path, order, remaining)
+
+        alpha_ids = [aid for aid in order if aid in remaining]
 
         if not alpha_ids:
             logger.warning("❌ 没有可提交的Alpha ID")
@@ -280,7 +770,7 @@ def submit_alpha_ids(alpha_id_path, num_to_submit=2):
 
         logger.info(f"\n📝 已保存的Alpha ID列表共 {len(alpha_ids)} 个")
 
-        # 实时提交并更新文件 (应用原则: SOLID单一职责, KISS保持简单)
+        # 实时提交并记录进度 (应用原则: SOLID单一职责, KISS保持简单)
         if num_to_submit > len(alpha_ids):
             num_to_submit = len(alpha_ids)
 
@@ -289,31 +779,34 @@ def submit_alpha_ids(alpha_id_path, num_to_submit=2):
 
         # 使用 try-finally 确保中断时也能保存进度
         try:
-            while len(successful) < num_to_submit and idx < len(alpha_ids):
-                alpha_id = alpha_ids[idx]
-
-                # 提交单个 Alpha
-                if brain.submit_alpha(alpha_id):
-                    successful.append(alpha_id)
-                    logger.info(f"✅ Alpha {alpha_id} 提交成功，立即更新文件")
-                else:
-                    failed.append(alpha_id)
-                    logger.warning(f"❌ Alpha {alpha_id} 提交失败，立即更新文件")
-
-                # 立即从文件中移除已处理的ID (无论成功或失败)
-                _remove_alpha_id_from_file(alpha_id_path, alpha_id)
+            with open(processed_path, 'a', buffering=1 << 16) as processed_log:
+                while len(successful) < num_to_submit and idx < len(alpha_ids):
+                    alpha_id = alpha_ids[idx]
+
+                    # 提交单个 Alpha
+                    if brain.submit_alpha(alpha_id):
+                        successful.append(alpha_id)
+                        logger.info(f"✅ Alpha {alpha_id} 提交成功，已记录进度")
+                    else:
+                        failed.append(alpha_id)
+                        logger.warning(f"❌ Alpha {alpha_id} 提交失败，已记录进度")
 
-                idx += 1
+                    # 立即追加记录已处理的ID (无论成功或失败)，只写一行而不是重写整个文件
+                    processed_log.write(f"{alpha_id}\n")
+                    processed_log.flush()
+                    remaining.discard(alpha_id)
 
-                # 如果还有更多alpha要提交，等待10秒
-                if len(successful) < num_to_submit and idx < len(alpha_ids):
-                    sleep(10)
+                    idx += 1
 
         except KeyboardInterrupt:
             logger.warning(f"⚠️ 用户中断! 已成功提交 {len(successful)} 个, 失败 {len(failed)} 个")
             logger.info(f"💾 进度已保存，剩余 {len(alpha_ids) - idx} 个待处理")
             raise
 
+        finally:
+            # 结束或中断时统一将剩余的ID写回文件
+            _save_remaining_alpha_ids(alpha_id_path, order, remaining)
+
         # 最终统计
         if len(successful) < num_to_submit:
             logger.warning(f"⚠️ 警告: 仅成功提交 {len(successful)} 个,目标是 {num_to_submit} 个")